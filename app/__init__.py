@@ -6,6 +6,7 @@ from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from dotenv import load_dotenv
 from flask_swagger_ui import get_swaggerui_blueprint
+from app.database import engine_options, configure_engine, run_migrations
 
 dotenv_path = os.path.join(os.path.dirname(__file__), ".env")
 load_dotenv(dotenv_path)
@@ -22,6 +23,9 @@ def create_app():
     app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv(
         "DATABASE_URI", "sqlite:///site.db"
     )
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(
+        app.config["SQLALCHEMY_DATABASE_URI"]
+    )
     app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY")
 
     db.init_app(app)
@@ -49,9 +53,10 @@ def create_app():
     swagger_ui_blueprint = get_swaggerui_blueprint(SWAGGER_URL, API_URL)
     app.register_blueprint(swagger_ui_blueprint, url_prefix=SWAGGER_URL)
 
-    db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "site.db")
-    if not os.path.exists(db_path):
-        with app.app_context():
-            db.create_all()
+    # Missing tables are created and migrations applied under one lock, so it
+    # is safe on every start even with several workers booting at once.
+    with app.app_context():
+        configure_engine(db.engine)
+        run_migrations(db.engine, db.metadata)
 
     return app
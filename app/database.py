@@ -0,0 +1,110 @@
+import os
+from sqlalchemy import event, inspect, text
+
+
+def _add_user_watchlist_version(conn):
+    columns = {column["name"] for column in inspect(conn).get_columns("user")}
+    if "watchlist_version" not in columns:
+        conn.execute(
+            text('ALTER TABLE "user" ADD COLUMN watchlist_version INTEGER NOT NULL DEFAULT 0')
+        )
+
+
+# Arbitrary key for the Postgres advisory lock that serializes migrations
+MIGRATION_LOCK_KEY = 727001
+
+# Versioned schema migrations, applied in order and recorded in schema_version.
+# Each step is a SQL string or a callable taking the connection. run_migrations
+# applies them under a database lock, so steps need not guard against other
+# workers migrating at the same time.
+MIGRATIONS = [
+    (
+        1,
+        "Index watchlist lookups by user, priority and title",
+        [
+            "CREATE INDEX IF NOT EXISTS ix_watchlist_user_priority ON watchlist (user_id, priority)",
+            "CREATE INDEX IF NOT EXISTS ix_watchlist_user_title ON watchlist (user_id, movie_title)",
+        ],
+    ),
+    (
+        2,
+        "Track a per-user watchlist version for conditional GETs",
+        [_add_user_watchlist_version],
+    ),
+]
+
+
+def engine_options(uri: str) -> dict:
+    """
+    Build SQLALCHEMY_ENGINE_OPTIONS for the given database URI.
+    SQLite gets a lock timeout; server databases get a sized, pre-pinged pool.
+    """
+    if uri.startswith("sqlite"):
+        busy_timeout_ms = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+        return {"connect_args": {"timeout": busy_timeout_ms / 1000}}
+
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": True,
+    }
+
+
+def configure_engine(engine):
+    """
+    Apply per-connection SQLite pragmas: WAL so readers don't block the writer,
+    a busy timeout so writers wait for the lock instead of failing, and a
+    relaxed synchronous level that is still crash-safe under WAL.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    journal_mode = os.getenv("DB_JOURNAL_MODE", "WAL")
+    busy_timeout_ms = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+    synchronous = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+        cursor.execute(f"PRAGMA busy_timeout={busy_timeout_ms}")
+        cursor.execute(f"PRAGMA synchronous={synchronous}")
+        cursor.close()
+
+
+def _lock_for_migrations(conn):
+    """
+    Take a database-wide write lock for the rest of the transaction so only one
+    worker at a time reads schema_version and applies migrations.
+    """
+    if conn.dialect.name == "sqlite":
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    elif conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+
+
+def run_migrations(engine, metadata):
+    """
+    Create any missing tables from `metadata`, then apply migrations newer than
+    the recorded schema version. Table creation, the version check, the
+    migration steps and the version insert all happen under one lock, so
+    workers starting together create the schema and apply each migration once.
+    """
+    with engine.begin() as conn:
+        _lock_for_migrations(conn)
+        metadata.create_all(conn)
+        conn.execute(text("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER PRIMARY KEY)"))
+        applied = {row[0] for row in conn.execute(text("SELECT version FROM schema_version"))}
+
+        for version, description, statements in MIGRATIONS:
+            if version in applied:
+                continue
+            print(f"Applying migration {version}: {description}")
+            for statement in statements:
+                if callable(statement):
+                    statement(conn)
+                else:
+                    conn.execute(text(statement))
+            conn.execute(text("INSERT INTO schema_version (version) VALUES (:v)"), {"v": version})
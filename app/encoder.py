@@ -0,0 +1,245 @@
+import json
+import os
+import tempfile
+import numpy as np
+
+
+def _write_atomically(path, write):
+    """
+    Call write(tmp_path) on a temporary file next to `path`, then rename it into
+    place, so concurrent workers never load a half-written model file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp.onnx")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def resolve_model_path(model_name: str) -> str:
+    """
+    Map a sentence-transformers model name to a local directory when
+    ENCODER_MODEL_DIR is set (e.g. ENCODER_MODEL_DIR/all-MiniLM-L6-v2).
+    Without it the name is returned unchanged.
+    """
+    model_dir = os.getenv("ENCODER_MODEL_DIR")
+    if model_dir:
+        return os.path.join(model_dir, model_name)
+    return model_name
+
+
+def load_encoder(model_name: str, device: str = "cpu"):
+    """
+    Build the overview encoder configured by the environment:
+
+    ENCODER_BACKEND   "torch" (default) or "onnx"
+    ENCODER_QUANTIZE  "1" to run the onnx backend on a dynamic int8 graph
+    ENCODER_THREADS   intra-op thread count (defaults to the runtime's own choice)
+
+    Both backends expose SentenceTransformer-style encode().
+    """
+    backend = os.getenv("ENCODER_BACKEND", "torch")
+    threads = int(os.getenv("ENCODER_THREADS", "0")) or None
+    model_path = resolve_model_path(model_name)
+
+    if backend == "onnx":
+        quantize = os.getenv("ENCODER_QUANTIZE", "0") == "1"
+        return OnnxEncoder(model_path, quantize=quantize, threads=threads)
+    if backend == "torch":
+        return TorchEncoder(model_path, device=device, threads=threads)
+    raise ValueError(f"Unknown ENCODER_BACKEND '{backend}', expected 'torch' or 'onnx'.")
+
+
+class TorchEncoder:
+    """
+    The reference PyTorch SentenceTransformer, with an optional thread cap.
+    """
+
+    def __init__(self, model_path: str, device: str = "cpu", threads: int = None):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if threads:
+            torch.set_num_threads(threads)
+        self.model = SentenceTransformer(model_path, device=device)
+
+    def encode(self, sentences, batch_size: int = 32, show_progress_bar: bool = False):
+        return self.model.encode(sentences, batch_size=batch_size, show_progress_bar=show_progress_bar)
+
+
+class OnnxEncoder:
+    """
+    Runs a locally saved sentence-transformers model through ONNX Runtime.
+
+    On first use the transformer is exported to <model_path>/onnx/model.onnx
+    (and, with quantize=True, dynamically quantized to model.int8.onnx); later
+    loads reuse those files. Pooling and normalization follow the model's own
+    sentence-transformers config so embeddings match the PyTorch reference.
+    Everything is read from `model_path`; nothing is fetched over the network.
+    """
+
+    def __init__(self, model_path: str, quantize: bool = False, threads: int = None):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        if not os.path.isdir(model_path):
+            raise FileNotFoundError(
+                f"ONNX encoder needs a local model directory, '{model_path}' does not exist. "
+                "Set ENCODER_MODEL_DIR to the folder holding the saved models."
+            )
+
+        self.model_path = model_path
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path, local_files_only=True)
+        self.max_seq_length, self.pooling_mode, self.normalize = self._read_st_config(model_path)
+
+        onnx_path = self._export(model_path)
+        if quantize:
+            onnx_path = self._quantize(onnx_path)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.inter_op_num_threads = 1
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    @staticmethod
+    def _read_st_config(model_path):
+        max_seq_length = 256
+        config_path = os.path.join(model_path, "sentence_bert_config.json")
+        if os.path.exists(config_path):
+            with open(config_path) as f:
+                max_seq_length = json.load(f).get("max_seq_length", max_seq_length)
+
+        pooling_mode, normalize = "mean", False
+        modules_path = os.path.join(model_path, "modules.json")
+        if os.path.exists(modules_path):
+            with open(modules_path) as f:
+                modules = json.load(f)
+            for module in modules:
+                if module["type"].endswith("Normalize"):
+                    normalize = True
+                if module["type"].endswith("Pooling"):
+                    with open(os.path.join(model_path, module["path"], "config.json")) as f:
+                        pooling_mode = OnnxEncoder._pooling_mode(json.load(f))
+        return max_seq_length, pooling_mode, normalize
+
+    @staticmethod
+    def _pooling_mode(pooling):
+        """
+        Read the pooling mode from a Pooling config, in either the newer
+        {"pooling_mode": "mean"} form or the older pooling_mode_*_token flags.
+        Only mean and CLS pooling are implemented.
+        """
+        if "pooling_mode" in pooling:
+            modes = pooling["pooling_mode"]
+            modes = [modes] if isinstance(modes, str) else list(modes)
+        else:
+            modes = [
+                key[len("pooling_mode_"):]
+                for key, enabled in pooling.items()
+                if key.startswith("pooling_mode_") and enabled
+            ]
+        modes = [{"mean_tokens": "mean", "cls_token": "cls"}.get(mode, mode) for mode in modes]
+
+        if len(modes) != 1 or modes[0] not in ("mean", "cls"):
+            raise ValueError(
+                f"ONNX encoder supports mean or cls pooling only, the model uses {modes or 'none'}."
+            )
+        return modes[0]
+
+    def _export(self, model_path):
+        onnx_path = os.path.join(model_path, "onnx", "model.onnx")
+        if os.path.exists(onnx_path):
+            return onnx_path
+
+        import torch
+        from transformers import AutoModel
+
+        print(f"Exporting {model_path} to ONNX...")
+        os.makedirs(os.path.dirname(onnx_path), exist_ok=True)
+        model = AutoModel.from_pretrained(model_path, local_files_only=True).eval()
+        sample = self.tokenizer(["an example overview"], return_tensors="pt")
+        input_names = [name for name in self.tokenizer.model_input_names if name in sample]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+        class _HiddenStates(torch.nn.Module):
+            # Pin the forward signature to the tokenizer inputs so export does not
+            # depend on the positional argument order of the model's forward().
+            def __init__(self, model):
+                super().__init__()
+                self.model = model
+
+            def forward(self, *inputs):
+                return self.model(**dict(zip(input_names, inputs))).last_hidden_state
+
+        def _write(tmp_path):
+            with torch.no_grad():
+                torch.onnx.export(
+                    _HiddenStates(model),
+                    tuple(sample[name] for name in input_names),
+                    tmp_path,
+                    input_names=input_names,
+                    output_names=["last_hidden_state"],
+                    dynamic_axes=dynamic_axes,
+                    opset_version=14,
+                    dynamo=False,
+                )
+
+        _write_atomically(onnx_path, _write)
+        return onnx_path
+
+    @staticmethod
+    def _quantize(onnx_path):
+        int8_path = onnx_path.replace(".onnx", ".int8.onnx")
+        if not os.path.exists(int8_path):
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            print("Quantizing ONNX encoder to int8...")
+            _write_atomically(
+                int8_path,
+                lambda tmp_path: quantize_dynamic(onnx_path, tmp_path, weight_type=QuantType.QInt8),
+            )
+        return int8_path
+
+    def encode(self, sentences, batch_size: int = 32, show_progress_bar: bool = False):
+        # Match SentenceTransformer.encode: a single string gives one (dim,) vector
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        # Batch similar lengths together to keep padding small, then restore order
+        order = np.argsort([-len(s) for s in sentences])
+        embeddings = []
+        for start in range(0, len(sentences), batch_size):
+            batch = [sentences[i] for i in order[start:start + batch_size]]
+            tokens = self.tokenizer(
+                batch, padding=True, truncation=True, max_length=self.max_seq_length, return_tensors="np"
+            )
+            feeds = {name: tokens[name].astype(np.int64) for name in self.input_names}
+            hidden = self.session.run(None, feeds)[0]
+            embeddings.append(self._pool(hidden, tokens["attention_mask"]))
+            if show_progress_bar:
+                print(f"Encoded {min(start + batch_size, len(sentences))}/{len(sentences)}")
+
+        if not embeddings:
+            return np.empty((0,), dtype=np.float32)
+        result = np.empty((len(sentences), embeddings[0].shape[1]), dtype=np.float32)
+        result[order] = np.concatenate(embeddings)
+        return result[0] if single else result
+
+    def _pool(self, hidden, attention_mask):
+        if self.pooling_mode == "cls":
+            pooled = hidden[:, 0]
+        else:
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if self.normalize:
+            pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.astype(np.float32)
@@ -0,0 +1,58 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+
+class ExecutorBusy(Exception):
+    """
+    Raised when the pool and its queue are already full.
+    """
+
+
+class BoundedExecutor:
+    """
+    A fixed-size thread pool for CPU-bound work (recommendation scoring) that
+    rejects new jobs once `max_workers + queue_depth` are in flight, so a burst
+    of slow recommendations can't tie up every web thread.
+
+    NumPy and FAISS release the GIL in their hot loops, so the pool threads run
+    in parallel with each other and with the request threads.
+    """
+
+    def __init__(self, max_workers: int, queue_depth: int, timeout: float):
+        self.max_workers = max_workers
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="recommender")
+        self._slots = threading.BoundedSemaphore(max_workers + queue_depth)
+
+    def submit(self, fn, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            raise ExecutorBusy("Recommendation workers are busy, try again shortly")
+        try:
+            future = self._pool.submit(fn, *args, **kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn, *args, **kwargs):
+        """
+        Submit `fn` and wait up to `timeout` seconds for its result. Raises
+        ExecutorBusy when the queue is full and TimeoutError when the job takes
+        too long; a job that has not started yet is cancelled on timeout.
+        """
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+
+recommendation_executor = BoundedExecutor(
+    max_workers=int(os.getenv("RECOMMENDER_THREADS", "2")),
+    queue_depth=int(os.getenv("RECOMMENDER_QUEUE_DEPTH", "4")),
+    timeout=float(os.getenv("RECOMMENDER_TIMEOUT", "10")),
+)
@@ -6,6 +6,8 @@ class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(150), unique=True, nullable=False)
     password = db.Column(db.String(150), nullable=False)
+    # Bumped on every watchlist change; backs the watchlist ETag
+    watchlist_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
 
 class Watchlist(db.Model):
@@ -15,3 +17,8 @@ class Watchlist(db.Model):
     priority = db.Column(db.Integer, nullable=False, default=0)
 
     user = db.relationship("User", backref=db.backref("watchlist", lazy=True))
+
+    __table_args__ = (
+        db.Index("ix_watchlist_user_priority", "user_id", "priority"),
+        db.Index("ix_watchlist_user_title", "user_id", "movie_title"),
+    )
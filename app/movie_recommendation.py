@@ -2,7 +2,7 @@ import os
 import numpy as np
 import pandas as pd
 
-from sentence_transformers import SentenceTransformer
+from app.encoder import load_encoder
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from sklearn.preprocessing import MultiLabelBinarizer
 from sklearn.metrics.pairwise import cosine_similarity  
@@ -29,9 +29,9 @@ if "title" not in movies_data.columns:
     raise ValueError("CSV must have a 'title' column.")
 
 # -------------------------------------------------------------------------
-# Sentence Transformer
+# Sentence Transformer (backend chosen by ENCODER_BACKEND, see app/encoder.py)
 # -------------------------------------------------------------------------
-sbert_model = SentenceTransformer("all-mpnet-base-v2", device="cpu")
+sbert_model = load_encoder("all-mpnet-base-v2", device="cpu")
 
 # -------------------------------------------------------------------------
 # 1) Overview Embeddings
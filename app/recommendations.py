@@ -1,14 +1,30 @@
 import os
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required
-from app.robust_movie_recommender import MovieRecommender  # Updated import
+from app.recommender_store import RecommenderStore, check_admin_token, parse_signal
+from app.executor import ExecutorBusy, recommendation_executor
 
 BASE_DIR = os.path.dirname(__file__)
-CSV_PATH = os.path.join(BASE_DIR, "combined_movies.2.csv")
-OVERVIEW_EMBEDDINGS_PATH = os.path.join(BASE_DIR, "overview_embeddings.npy")
+CSV_PATH = os.getenv("MOVIES_CSV_PATH", os.path.join(BASE_DIR, "combined_movies.2.csv"))
+OVERVIEW_EMBEDDINGS_PATH = os.getenv(
+    "OVERVIEW_EMBEDDINGS_PATH", os.path.join(BASE_DIR, "overview_embeddings.npy")
+)
 
-# Instantiate the recommender only one time at startup
-recommender = MovieRecommender(CSV_PATH, OVERVIEW_EMBEDDINGS_PATH, device="cpu", use_faiss=True)
+# Touched by the reload endpoint and watched by every worker serving this catalog.
+# Kept next to the catalog so other deployments on the same host don't share it.
+RELOAD_MARKER_PATH = os.getenv("RECOMMENDER_RELOAD_MARKER", CSV_PATH + ".reload")
+
+# Instantiate the recommender only one time at startup; reloads swap it in place
+recommender_store = RecommenderStore(
+    CSV_PATH, OVERVIEW_EMBEDDINGS_PATH, device="cpu", use_faiss=True, reload_marker=RELOAD_MARKER_PATH
+)
+
+# Reload triggers: an optional signal name (e.g. "SIGUSR2"), sent to each worker pid, and a
+# file watch interval in seconds covering the catalog, embeddings and reload marker (0 disables it)
+if os.getenv("RECOMMENDER_RELOAD_SIGNAL"):
+    recommender_store.install_signal_handler(parse_signal(os.getenv("RECOMMENDER_RELOAD_SIGNAL")))
+if float(os.getenv("RECOMMENDER_WATCH_INTERVAL", "5")) > 0:
+    recommender_store.watch(float(os.getenv("RECOMMENDER_WATCH_INTERVAL", "5")))
 
 recommendations_blueprint = Blueprint("recommendations", __name__)
 
@@ -25,15 +41,23 @@ def get_recommendations():
     genre_weight = request.args.get("genre_weight", default=0.3, type=float)
     sentiment_weight = request.args.get("sentiment_weight", default=0.1, type=float)
 
+    # Hold on to this snapshot for the whole request, even if a reload swaps it
+    recommender = recommender_store.get()
     try:
-        recs = recommender.recommend(
+        # Score on the dedicated recommendation pool so web threads stay free
+        recs = recommendation_executor.run(
+            recommender.recommend,
             movie_title=title,
             top_n=top_n,
-            min_vote_average=min_vote,
+            min_vote=min_vote,
             plot_weight=plot_weight,
             genre_weight=genre_weight,
             sentiment_weight=sentiment_weight
         )
+    except ExecutorBusy as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
+    except TimeoutError:
+        return jsonify({"error": "Recommendation timed out"}), 504
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -42,3 +66,47 @@ def get_recommendations():
 
     recommended_titles = [r[0] for r in recs]
     return jsonify(recommended_titles), 200
+
+
+@recommendations_blueprint.route("/recommendations/reload", methods=["POST"])
+def reload_recommendations():
+    """
+    Rebuilds the movie catalog and index in the background and swaps it in once ready.
+    Touches the reload marker so every worker reloads within one watch interval; if
+    the watch is disabled (RECOMMENDER_WATCH_INTERVAL=0) only the worker answering
+    this request reloads, so multi-worker deploys should send RECOMMENDER_RELOAD_SIGNAL
+    to each worker pid instead. Signalling the gunicorn master does not reach this
+    handler (SIGHUP there restarts every worker from cold).
+    Requires the X-Admin-Token header to match ADMIN_TOKEN.
+    """
+    if not check_admin_token(request.headers.get("X-Admin-Token", "")):
+        return jsonify({"error": "Admin token required"}), 403
+
+    if recommender_store.watching:
+        recommender_store.request_reload()
+        return jsonify({"message": "Reload requested for all workers"}), 202
+
+    if not recommender_store.reload():
+        return jsonify({"error": "A reload is already in progress"}), 409
+
+    return jsonify({"message": "Reload started in this worker only", "pid": os.getpid()}), 202
+
+
+@recommendations_blueprint.route("/recommendations/reload", methods=["GET"])
+def reload_status():
+    """
+    Reports the catalog generation and the outcome of the last reload for the worker
+    answering this request (identified by pid); other workers keep their own counts.
+    """
+    if not check_admin_token(request.headers.get("X-Admin-Token", "")):
+        return jsonify({"error": "Admin token required"}), 403
+
+    return jsonify(
+        {
+            "pid": os.getpid(),
+            "generation": recommender_store.generation,
+            "reloading": recommender_store.reloading,
+            "last_error": recommender_store.last_error,
+            "movies": len(recommender_store.get().movies_data),
+        }
+    ), 200
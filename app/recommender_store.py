@@ -0,0 +1,171 @@
+import gc
+import hmac
+import os
+import signal
+import threading
+import time
+
+from app.robust_movie_recommender import MovieRecommender
+
+
+class RecommenderStore:
+    """
+    Holds the live MovieRecommender and swaps in a freshly built one without
+    restarting the worker. Request handlers grab a snapshot with get() and keep
+    using that object for the rest of the request, so a reload never changes
+    the catalog out from under an in-flight recommendation.
+
+    New catalog files should be published by writing them next to the old ones
+    and renaming over the configured paths; the old snapshot may still have the
+    previous embeddings file memory-mapped until its last request finishes.
+
+    Each gunicorn worker has its own store. To reload all of them, touch
+    `reload_marker` (see request_reload()); every worker's watch() picks it up.
+    """
+
+    def __init__(self, csv_path: str, embeddings_path: str, device: str = "cpu", use_faiss: bool = True,
+                 reload_marker: str = None):
+        self.csv_path = csv_path
+        self.embeddings_path = embeddings_path
+        self.reload_marker = reload_marker
+        self.device = device
+        self.use_faiss = use_faiss
+
+        self._current = MovieRecommender(csv_path, embeddings_path, device=device, use_faiss=use_faiss)
+        self._swap_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+
+        self.generation = 0
+        self.last_error = None
+
+    def get(self) -> MovieRecommender:
+        """
+        Return the current recommender snapshot.
+        """
+        return self._current
+
+    @property
+    def reloading(self) -> bool:
+        return self._reload_lock.locked()
+
+    def reload(self, wait: bool = False) -> bool:
+        """
+        Rebuild the recommender from the configured paths in a background thread
+        and swap it in once it is fully loaded. Returns False if a reload is
+        already running.
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+
+        thread = threading.Thread(target=self._build_and_swap, name="recommender-reload", daemon=True)
+        thread.start()
+        if wait:
+            thread.join()
+        return True
+
+    def _build_and_swap(self):
+        try:
+            print(f"Building new recommender from {self.csv_path}...")
+            current = self._current
+            fresh = MovieRecommender(
+                self.csv_path, self.embeddings_path, device=self.device, use_faiss=self.use_faiss
+            )
+
+            # The encoder and sentiment analyzer do not depend on the catalog, so
+            # reuse them instead of paying the model load a second time.
+            fresh.sbert_model = current.sbert_model
+            fresh.sentiment_analyzer = current.sentiment_analyzer
+            fresh._lazy_load_resources()
+
+            if fresh.overview_normalized.shape[0] != len(fresh.movies_data):
+                raise ValueError(
+                    f"Embeddings have {fresh.overview_normalized.shape[0]} rows "
+                    f"but the catalog has {len(fresh.movies_data)} movies."
+                )
+
+            with self._swap_lock:
+                self._current = fresh
+                self.generation += 1
+            self.last_error = None
+            print(f"Recommender reloaded (generation {self.generation}, {len(fresh.movies_data)} movies)")
+
+            # Requests still holding the old snapshot keep it alive; once they
+            # finish, this is the last reference and the memory is released.
+            del current
+            gc.collect()
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"Recommender reload failed, keeping the current catalog: {e}")
+        finally:
+            self._reload_lock.release()
+
+    def request_reload(self):
+        """
+        Ask every process watching `reload_marker` to reload by bumping its mtime.
+        """
+        with open(self.reload_marker, "a"):
+            pass
+        os.utime(self.reload_marker)
+
+    @property
+    def watching(self) -> bool:
+        return self._watcher is not None
+
+    def install_signal_handler(self, signum: int):
+        """
+        Reload whenever the process receives `signum`. Must be called from the
+        main thread. Under gunicorn the signal has to be sent to each worker pid;
+        the master handles its own signals (SIGHUP restarts every worker).
+        """
+        signal.signal(signum, lambda *_: self.reload())
+
+    def watch(self, interval: float = 30.0):
+        """
+        Poll the catalog, embeddings and reload marker files and reload when
+        any of them changes.
+        """
+        if self._watcher is not None:
+            return
+
+        paths = [self.csv_path, self.embeddings_path]
+        if self.reload_marker:
+            paths.append(self.reload_marker)
+
+        def _mtimes():
+            return tuple(
+                os.stat(path).st_mtime_ns if os.path.exists(path) else None
+                for path in paths
+            )
+
+        def _poll():
+            last_seen = _mtimes()
+            while True:
+                time.sleep(interval)
+                seen = _mtimes()
+                if seen != last_seen and self.reload():
+                    last_seen = seen
+
+        self._watcher = threading.Thread(target=_poll, name="recommender-watch", daemon=True)
+        self._watcher.start()
+
+
+def parse_signal(name: str) -> int:
+    """
+    Resolve a signal name such as "SIGUSR2" or "USR2" to its number.
+    """
+    signum = getattr(signal, name if name.startswith("SIG") else f"SIG{name}", None)
+    if not isinstance(signum, signal.Signals):
+        raise ValueError(f"Unknown reload signal '{name}', expected a name such as 'SIGUSR2'.")
+    return signum
+
+
+def check_admin_token(token: str) -> bool:
+    """
+    Compare `token` against the ADMIN_TOKEN environment variable. Admin
+    endpoints are disabled when ADMIN_TOKEN is not set.
+    """
+    expected = os.getenv("ADMIN_TOKEN")
+    if not expected or not token:
+        return False
+    return hmac.compare_digest(token, expected)
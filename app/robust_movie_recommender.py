@@ -1,10 +1,11 @@
 import os
+import threading
 import numpy as np
 import pandas as pd
 import faiss
-from sentence_transformers import SentenceTransformer
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from sklearn.preprocessing import MultiLabelBinarizer
+from app.encoder import load_encoder
 
 class MovieRecommender:
     def __init__(self, csv_path: str, embeddings_path: str, device: str = "cpu", use_faiss: bool = True):
@@ -39,16 +40,18 @@ class MovieRecommender:
         self.overview_embeddings = None
         self.overview_normalized = None
         self.faiss_index = None
+        self._load_lock = threading.Lock()
 
     def _lazy_load_resources(self):
         """
         Lazy-load heavy resources (the transformer model, sentiment analyzer, embeddings, and FAISS index)
-        only when they are needed.
+        only when they are needed. Guarded by a lock so concurrent first requests load them once.
         """
-        if self.sbert_model is None:
-            print("Loading transformer model...")
-            self.sbert_model = SentenceTransformer("all-MiniLM-L6-v2", device=self.device)
+        with self._load_lock:
+            self._load_resources()
 
+    def _load_resources(self):
+        if self.sentiment_analyzer is None:
             print("Loading sentiment analyzer...")
             self.sentiment_analyzer = SentimentIntensityAnalyzer()
         
@@ -68,6 +71,12 @@ class MovieRecommender:
             print("Loading precomputed overview embeddings with memory mapping...")
             overview_embeddings = np.load(self.embeddings_path, mmap_mode='r')
         else:
+            # The transformer is only needed to encode overviews, so skip loading it
+            # entirely when precomputed embeddings are on disk.
+            if self.sbert_model is None:
+                print("Loading transformer model...")
+                self.sbert_model = load_encoder("all-MiniLM-L6-v2", device=self.device)
+
             print("Computing overview embeddings (this may take a while)...")
             overview_embeddings = self.sbert_model.encode(
                 self.movies_data["overview"].tolist(),
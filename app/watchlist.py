@@ -1,11 +1,29 @@
-from flask import Blueprint, jsonify, request
+import os
+from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import jwt_required
-from app.models import Watchlist
+from app.models import User, Watchlist
 from app import db
+from app.cache import LRUCache
 from app.utils import get_current_user
 
 watchlist_blueprint = Blueprint("watchlist", __name__)
 
+# Serialized watchlists keyed by (user_id, watchlist_version). A version bump
+# changes the key, so stale entries are never served and simply age out.
+watchlist_cache = LRUCache(maxsize=int(os.getenv("WATCHLIST_CACHE_SIZE", "1024")))
+
+
+def bump_watchlist_version(user):
+    """
+    Marks the user's watchlist as changed. Done as a SQL increment so
+    concurrent writers across workers can't lose an update.
+    """
+    user.watchlist_version = User.watchlist_version + 1
+
+
+def watchlist_etag(user):
+    return f"{user.id}-{user.watchlist_version}"
+
 
 @watchlist_blueprint.route("/add", methods=["POST"])
 @jwt_required()
@@ -37,6 +55,7 @@ def add_to_watchlist():
         user_id=user.id, movie_title=movie_title, priority=new_priority
     )
     db.session.add(new_watchlist_entry)
+    bump_watchlist_version(user)
     db.session.commit()
 
     print(f"Movie '{movie_title}' added to watchlist for user '{user.username}'")
@@ -48,15 +67,29 @@ def add_to_watchlist():
 def view_watchlist():
     """
     Retrieves the user's watchlist, ordered by priority.
+    Answers If-None-Match with 304 when the watchlist has not changed.
     """
     user = get_current_user()
-    watchlist = (
-        Watchlist.query.filter_by(user_id=user.id).order_by(Watchlist.priority).all()
-    )
-    movies = [
-        {"title": entry.movie_title, "priority": entry.priority} for entry in watchlist
-    ]
-    return jsonify(movies), 200
+    etag = watchlist_etag(user)
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+
+    body = watchlist_cache.get((user.id, user.watchlist_version))
+    if body is None:
+        watchlist = (
+            Watchlist.query.filter_by(user_id=user.id).order_by(Watchlist.priority).all()
+        )
+        movies = [
+            {"title": entry.movie_title, "priority": entry.priority} for entry in watchlist
+        ]
+        body = current_app.json.dumps(movies)
+        watchlist_cache.set((user.id, user.watchlist_version), body)
+
+    response = current_app.response_class(body, status=200, mimetype="application/json")
+    response.set_etag(etag)
+    return response
 
 
 @watchlist_blueprint.route("/remove", methods=["POST"])
@@ -80,6 +113,7 @@ def remove_from_watchlist():
         return jsonify({"error": f'"{movie_title}" is not in your watchlist'}), 404
 
     db.session.delete(watchlist_entry)
+    bump_watchlist_version(user)
     db.session.commit()
 
     return jsonify({"message": f'"{movie_title}" removed from your watchlist!'}), 200
@@ -114,6 +148,7 @@ def move_movie_up():
             movie_above.priority,
             current_movie.priority,
         )
+        bump_watchlist_version(user)
         db.session.commit()
 
     return jsonify({"message": f'"{movie_title}" moved up in the watchlist'}), 200
@@ -148,6 +183,88 @@ def move_movie_down():
             movie_below.priority,
             current_movie.priority,
         )
+        bump_watchlist_version(user)
         db.session.commit()
 
     return jsonify({"message": f'"{movie_title}" moved down in the watchlist'}), 200
+
+
+@watchlist_blueprint.route("/add-bulk", methods=["POST"])
+@jwt_required()
+def add_many_to_watchlist():
+    """
+    Adds several movies to the user's watchlist in one transaction.
+    Titles already in the watchlist are skipped.
+    """
+    data = request.json
+    movie_titles = data.get("movie_titles")
+
+    if not movie_titles or not isinstance(movie_titles, list):
+        return jsonify({"error": "A list of movie titles is required"}), 400
+
+    user = get_current_user()
+    existing = {
+        title
+        for (title,) in db.session.query(Watchlist.movie_title).filter_by(user_id=user.id)
+    }
+    highest_priority = (
+        db.session.query(db.func.max(Watchlist.priority))
+        .filter_by(user_id=user.id)
+        .scalar()
+    ) or 0
+
+    added, skipped = [], []
+    for movie_title in movie_titles:
+        if not isinstance(movie_title, str) or not movie_title or movie_title in existing:
+            skipped.append(movie_title)
+            continue
+        highest_priority += 1
+        db.session.add(
+            Watchlist(user_id=user.id, movie_title=movie_title, priority=highest_priority)
+        )
+        existing.add(movie_title)
+        added.append(movie_title)
+
+    if added:
+        bump_watchlist_version(user)
+        db.session.commit()
+
+    return jsonify({"added": added, "skipped": skipped}), 200
+
+
+@watchlist_blueprint.route("/remove-bulk", methods=["POST"])
+@jwt_required()
+def remove_many_from_watchlist():
+    """
+    Removes several movies from the user's watchlist in one transaction.
+    Titles not in the watchlist, and items that are not titles, are reported as not found.
+    """
+    data = request.json
+    movie_titles = data.get("movie_titles")
+
+    if not movie_titles or not isinstance(movie_titles, list):
+        return jsonify({"error": "A list of movie titles is required"}), 400
+
+    user = get_current_user()
+    titles = [title for title in movie_titles if isinstance(title, str) and title]
+    entries = []
+    if titles:
+        entries = Watchlist.query.filter(
+            Watchlist.user_id == user.id, Watchlist.movie_title.in_(titles)
+        ).all()
+
+    for entry in entries:
+        db.session.delete(entry)
+
+    if entries:
+        bump_watchlist_version(user)
+        db.session.commit()
+
+    removed = [entry.movie_title for entry in entries]
+    removed_titles = set(removed)
+    not_found = [
+        title
+        for title in movie_titles
+        if not isinstance(title, str) or title not in removed_titles
+    ]
+    return jsonify({"removed": removed, "not_found": not_found}), 200
@@ -0,0 +1,27 @@
+import os
+
+# Keep BLAS/OpenMP to one thread per scoring job; parallelism comes from the
+# recommendation pool (RECOMMENDER_THREADS) instead of oversubscribing cores.
+# Set here so it is in place before the workers import NumPy and FAISS.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Threaded workers: auth and watchlist calls are I/O bound and get their own
+# request threads, while recommendation scoring is handed off to the bounded
+# pool in app/executor.py. Keep GUNICORN_THREADS above
+# RECOMMENDER_THREADS + RECOMMENDER_QUEUE_DEPTH so a recommendation burst
+# can't occupy every request thread.
+worker_class = "gthread"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+
+# The first recommendation may still load the model and index lazily.
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
@@ -0,0 +1,75 @@
+"""
+Accuracy and throughput check for the overview encoder backends.
+
+Encodes a sample of catalog overviews with the PyTorch reference model and
+the ONNX Runtime backend (fp32 and dynamic int8), reports texts/s for each and
+fails if any ONNX embedding drifts past the cosine tolerance. The model is
+read from a local directory; nothing is downloaded.
+
+    python tools/encoder_bench.py --model-dir models/all-MiniLM-L6-v2 --sample 500
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from app.encoder import OnnxEncoder, TorchEncoder  # noqa: E402
+
+
+def timed_encode(encoder, texts, batch_size):
+    encoder.encode(texts[:batch_size], batch_size=batch_size)  # warm-up
+    start = time.perf_counter()
+    embeddings = encoder.encode(texts, batch_size=batch_size)
+    return np.asarray(embeddings, dtype=np.float32), time.perf_counter() - start
+
+
+def row_cosine(a, b):
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return (a * b).sum(axis=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model-dir", required=True, help="local sentence-transformers model directory")
+    parser.add_argument("--csv", default=os.path.join(REPO_ROOT, "app", "combined_movies.2.csv"))
+    parser.add_argument("--sample", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=None, help="intra-op threads for every backend")
+    parser.add_argument("--fp32-tolerance", type=float, default=0.9999, help="minimum cosine vs reference")
+    parser.add_argument("--int8-tolerance", type=float, default=0.98, help="minimum cosine vs reference")
+    args = parser.parse_args()
+
+    overviews = pd.read_csv(args.csv)["overview"].fillna("")
+    texts = overviews.sample(n=min(args.sample, len(overviews)), random_state=0).tolist()
+
+    reference, reference_time = timed_encode(
+        TorchEncoder(args.model_dir, threads=args.threads), texts, args.batch_size
+    )
+    print(f"{'backend':<10}{'texts/s':>10}{'speedup':>9}{'min cos':>10}{'mean cos':>10}")
+    print(f"{'torch':<10}{len(texts) / reference_time:>10.1f}{1.0:>9.2f}{1.0:>10.5f}{1.0:>10.5f}")
+
+    failed = False
+    for name, quantize, tolerance in [("onnx", False, args.fp32_tolerance), ("onnx-int8", True, args.int8_tolerance)]:
+        encoder = OnnxEncoder(args.model_dir, quantize=quantize, threads=args.threads)
+        embeddings, elapsed = timed_encode(encoder, texts, args.batch_size)
+        cosine = row_cosine(reference, embeddings)
+        print(
+            f"{name:<10}{len(texts) / elapsed:>10.1f}{reference_time / elapsed:>9.2f}"
+            f"{cosine.min():>10.5f}{cosine.mean():>10.5f}"
+        )
+        if cosine.min() < tolerance:
+            print(f"  {name} is below the {tolerance} cosine tolerance")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+"""
+Load-replay harness for the whole Flask app.
+
+Builds a throwaway stack (temporary SQLite database, synthetic movie catalog
+with precomputed embeddings, so no model download or network is needed),
+then replays our traffic mix against it: register/login bursts, watchlist
+add/move/remove/view and recommendation calls with Zipf-distributed titles.
+Prints throughput and latency percentiles per endpoint.
+
+    python tools/load_replay.py --users 20 --duration 30
+    python tools/load_replay.py --mode gunicorn --users 40 --duration 60
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+GENRES = ["action", "comedy", "drama", "horror", "romance", "sci-fi", "thriller", "animation", "documentary"]
+WORDS = (
+    "a young hero journey city family secret war love detective mystery space crew "
+    "small town friendship betrayal revenge escape dream island haunted future past"
+).split()
+
+# Served by the Swagger UI blueprint; used to tell when a gunicorn worker is up
+READY_PATH = "/swagger/"
+
+# Warm-up sessions use their own seeds so their usernames don't collide with the run
+WARMUP_SEED_OFFSET = 100000
+
+# (operation, weight) of a steady-state session step
+TRAFFIC_MIX = [
+    ("watchlist_view", 30),
+    ("recommendations", 25),
+    ("watchlist_add", 15),
+    ("watchlist_move", 10),
+    ("watchlist_remove", 10),
+    ("login", 10),
+]
+
+
+def build_catalog(directory, num_movies, dim, seed):
+    """
+    Write a synthetic catalog CSV and matching overview embeddings.
+    Movies are drawn around a handful of topic centroids so FAISS neighbours
+    are meaningful rather than uniform noise.
+    """
+    rng = np.random.default_rng(seed)
+    titles = [f"Synthetic Movie {i:05d}" for i in range(num_movies)]
+    movies = pd.DataFrame(
+        {
+            "title": titles,
+            "overview": [" ".join(rng.choice(WORDS, size=20)) for _ in range(num_movies)],
+            "genres": [", ".join(rng.choice(GENRES, size=rng.integers(1, 4), replace=False)) for _ in range(num_movies)],
+            "sentiment": rng.uniform(-1, 1, size=num_movies).round(4),
+            "vote_average": rng.uniform(3, 9, size=num_movies).round(1),
+        }
+    )
+    csv_path = os.path.join(directory, "catalog.csv")
+    movies.to_csv(csv_path, index=False)
+
+    centroids = rng.normal(size=(16, dim))
+    embeddings = centroids[rng.integers(0, 16, size=num_movies)] + 0.5 * rng.normal(size=(num_movies, dim))
+    embeddings_path = os.path.join(directory, "embeddings.npy")
+    np.save(embeddings_path, embeddings.astype(np.float32))
+    return titles, csv_path, embeddings_path
+
+
+def stack_env(directory, csv_path, embeddings_path):
+    return {
+        "DATABASE_URI": f"sqlite:///{os.path.join(directory, 'load.db')}",
+        "MOVIES_CSV_PATH": csv_path,
+        "OVERVIEW_EMBEDDINGS_PATH": embeddings_path,
+        "SECRET_KEY": "load-replay",
+        "JWT_SECRET_KEY": "load-replay-jwt-secret-key-32-bytes",
+    }
+
+
+class InProcessClient:
+    """
+    Drives the app through Flask's test client; one instance per thread.
+    """
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, payload=None, token=None):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        response = self.client.open(path, method=method, json=payload, headers=headers)
+        return response.status_code, response.get_json(silent=True)
+
+
+class HttpClient:
+    """
+    Drives a running server over HTTP using only the standard library.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def request(self, method, path, payload=None, token=None):
+        data = json.dumps(payload).encode() if payload is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method)
+        req.add_header("Content-Type", "application/json")
+        if token:
+            req.add_header("Authorization", f"Bearer {token}")
+        try:
+            with urllib.request.urlopen(req, timeout=60) as response:
+                return response.status, json.loads(response.read() or "null")
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint, status, elapsed):
+        with self._lock:
+            self.latencies[endpoint].append(elapsed)
+            self.statuses[endpoint][status // 100 * 100] += 1
+
+    def report(self, wall_time):
+        header = f"{'endpoint':<18}{'count':>7}{'req/s':>9}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}  status"
+        print(header)
+        print("-" * len(header))
+        total = 0
+        for endpoint in sorted(self.latencies):
+            samples = np.array(self.latencies[endpoint]) * 1000
+            total += len(samples)
+            p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+            statuses = " ".join(f"{code // 100}xx={n}" for code, n in sorted(self.statuses[endpoint].items()))
+            print(
+                f"{endpoint:<18}{len(samples):>7}{len(samples) / wall_time:>9.1f}"
+                f"{p50:>9.1f}{p90:>9.1f}{p99:>9.1f}{samples.max():>9.1f}  {statuses}"
+            )
+        print(f"\n{total} requests in {wall_time:.1f}s ({total / wall_time:.1f} req/s)")
+
+
+def zipf_popularity(titles, exponent, seed):
+    """
+    Rank titles in a random (but shared) order and return cumulative Zipf weights.
+    """
+    order = list(titles)
+    random.Random(seed).shuffle(order)
+    ranks = np.arange(1, len(order) + 1)
+    return order, np.cumsum(1.0 / ranks**exponent).tolist()
+
+
+def run_user(client, user_index, deadline, pick_title, recorder, seed):
+    rng = random.Random(seed)
+    username, password = f"load-user-{user_index}-{seed}", "load-password"
+    watchlist = []
+
+    def call(endpoint, method, path, payload=None, token=None):
+        start = time.perf_counter()
+        status, body = client.request(method, path, payload, token)
+        recorder.record(endpoint, status, time.perf_counter() - start)
+        return status, body
+
+    # Register/login burst at session start
+    call("register", "POST", "/api/auth/register", {"username": username, "password": password})
+    status, body = call("login", "POST", "/api/auth/login", {"username": username, "password": password})
+    if status != 200:
+        return
+    token = body["access_token"]
+
+    operations, weights = zip(*TRAFFIC_MIX)
+    while time.perf_counter() < deadline:
+        operation = rng.choices(operations, weights=weights)[0]
+        if operation == "watchlist_view":
+            call(operation, "GET", "/api/watchlist", token=token)
+        elif operation == "recommendations":
+            title = urllib.request.quote(pick_title())
+            call(operation, "GET", f"/api/recommendations?title={title}&top_n=10", token=token)
+        elif operation == "watchlist_add":
+            title = pick_title()
+            status, _ = call(operation, "POST", "/api/watchlist/add", {"movie_title": title}, token)
+            if status == 200:
+                watchlist.append(title)
+        elif operation == "watchlist_move" and watchlist:
+            path = rng.choice(["/api/watchlist/move-up", "/api/watchlist/move-down"])
+            call(operation, "POST", path, {"movie_title": rng.choice(watchlist)}, token)
+        elif operation == "watchlist_remove" and watchlist:
+            title = watchlist.pop(rng.randrange(len(watchlist)))
+            call(operation, "POST", "/api/watchlist/remove", {"movie_title": title}, token)
+        elif operation == "login":
+            status, body = call(operation, "POST", "/api/auth/login", {"username": username, "password": password})
+            if status == 200:
+                token = body["access_token"]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_gunicorn(env, port):
+    """
+    Start gunicorn and wait until a worker answers HTTP. The master accepts TCP
+    connections before any worker has imported the app, so a socket connect is
+    not a readiness signal.
+    """
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py", "--bind", f"127.0.0.1:{port}",
+         "--access-logfile", "/dev/null", "main:app"],
+        cwd=REPO_ROOT,
+        env={**os.environ, **env},
+    )
+    for _ in range(600):
+        if process.poll() is not None:
+            raise RuntimeError("gunicorn exited during startup")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}{READY_PATH}", timeout=1) as response:
+                if response.status == 200:
+                    return process
+        except OSError:
+            pass
+        time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("gunicorn did not become ready in time")
+
+
+def replay(make_client, users, duration, order, cum_weights, seed):
+    """
+    Run `users` concurrent sessions for `duration` seconds and return the Recorder
+    and the wall time they took.
+    """
+    recorder = Recorder()
+    start = time.perf_counter()
+    deadline = start + duration
+    threads = []
+    for n in range(users):
+        title_rng = random.Random(seed + n)
+        pick_title = lambda rng=title_rng: rng.choices(order, cum_weights=cum_weights)[0]  # noqa: E731
+        thread = threading.Thread(
+            target=run_user, args=(make_client(), n, deadline, pick_title, recorder, seed + n)
+        )
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    return recorder, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mode", choices=["inprocess", "gunicorn"], default="inprocess")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of steady-state traffic")
+    parser.add_argument("--movies", type=int, default=5000, help="synthetic catalog size")
+    parser.add_argument("--dim", type=int, default=384, help="embedding dimension")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent for title popularity")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds of unrecorded traffic before measuring")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="load-replay-")
+    process = None
+    try:
+        titles, csv_path, embeddings_path = build_catalog(directory, args.movies, args.dim, args.seed)
+        env = stack_env(directory, csv_path, embeddings_path)
+
+        if args.mode == "inprocess":
+            os.environ.update(env)
+            from app import create_app
+
+            app = create_app()
+            make_client = lambda: InProcessClient(app)  # noqa: E731
+        else:
+            port = free_port()
+            process = start_gunicorn(env, port)
+            make_client = lambda: HttpClient(f"http://127.0.0.1:{port}")  # noqa: E731
+
+        order, cum_weights = zipf_popularity(titles, args.zipf, args.seed)
+
+        # Unrecorded warm-up so lazy loading of the catalog and index in each
+        # worker doesn't land in the measured latencies
+        if args.warmup > 0:
+            replay(make_client, args.users, args.warmup, order, cum_weights, args.seed + WARMUP_SEED_OFFSET)
+
+        recorder, wall_time = replay(make_client, args.users, args.duration, order, cum_weights, args.seed)
+
+        print(f"mode={args.mode} users={args.users} movies={args.movies} zipf={args.zipf}\n")
+        recorder.report(wall_time)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
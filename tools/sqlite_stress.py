@@ -0,0 +1,87 @@
+"""
+Concurrent-writer stress check for the SQLite engine settings.
+
+Spins up several threads that add watchlist entries the same way
+add_to_watchlist does (read max priority, insert, commit) against a local
+SQLite file, then reports throughput and any lock errors.
+
+    python tools/sqlite_stress.py --writers 8 --inserts 200
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, select, text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from app import db  # noqa: E402
+from app.database import configure_engine, engine_options, run_migrations  # noqa: E402
+from app.models import User, Watchlist  # noqa: E402
+
+
+def writer(engine, user_id, inserts, errors):
+    for i in range(inserts):
+        try:
+            with engine.begin() as conn:
+                highest = conn.execute(
+                    select(func.max(Watchlist.priority)).where(Watchlist.user_id == user_id)
+                ).scalar()
+                conn.execute(
+                    Watchlist.__table__.insert().values(
+                        user_id=user_id, movie_title=f"Movie {i}", priority=(highest or 0) + 1
+                    )
+                )
+        except OperationalError as e:
+            errors.append(str(e))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--inserts", type=int, default=200)
+    parser.add_argument("--db", help="SQLite file to use (defaults to a temporary file)")
+    args = parser.parse_args()
+
+    db_file = args.db or os.path.join(tempfile.mkdtemp(), "stress.db")
+    uri = f"sqlite:///{db_file}"
+    engine = create_engine(uri, **engine_options(uri))
+    configure_engine(engine)
+    run_migrations(engine, db.metadata)
+
+    with engine.begin() as conn:
+        mode = conn.execute(text("PRAGMA journal_mode")).scalar()
+        for n in range(args.writers):
+            conn.execute(User.__table__.insert().values(username=f"stress{n}", password="x"))
+        user_ids = [row[0] for row in conn.execute(select(User.id))]
+
+    errors = []
+    threads = [
+        threading.Thread(target=writer, args=(engine, user_id, args.inserts, errors))
+        for user_id in user_ids
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    with engine.connect() as conn:
+        written = conn.execute(select(func.count()).select_from(Watchlist)).scalar()
+
+    expected = args.writers * args.inserts
+    print(f"journal_mode={mode} writers={args.writers} db={db_file}")
+    print(f"{written}/{expected} rows in {elapsed:.2f}s ({written / elapsed:.0f} commits/s), {len(errors)} lock errors")
+    for message in errors[:5]:
+        print("  ", message)
+
+    return 0 if written == expected and not errors else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())